@@ -0,0 +1,34 @@
+"""
+Stream-check a file of declarations: python -m mltt FILE...
+"""
+
+import argparse
+import sys
+from .syntax.parser import ParseError
+from .core.checker import TypeChecker, TypeError
+from .core.stream import check_file
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="mltt", description="流式检查声明文件")
+    parser.add_argument("files", nargs="+", help="声明文件")
+    parser.add_argument("--report-every", type=int, default=100000,
+                        help="每检查多少个声明输出一次吞吐量，0表示不输出")
+    args = parser.parse_args(argv)
+    if args.report_every < 0:
+        parser.error("--report-every 不能为负数")
+
+    checker = TypeChecker()
+    progress = lambda stats: print(f"  {stats}", file=sys.stderr)
+    for path in args.files:
+        try:
+            stats = check_file(path, checker, progress=progress, report_every=args.report_every)
+        except (ParseError, TypeError, OSError, UnicodeDecodeError) as e:
+            print(f"{path}: {e}", file=sys.stderr)
+            return 1
+        print(f"{path}: {stats}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,34 @@
-from typing import Dict, Optional
+from collections import ChainMap
+from typing import Dict, MutableMapping, Optional
 from .syntax.terms import Term
 
+# 扩展链超过该层数时合并局部层，使变量查找保持常数时间
+MAX_LAYERS = 32
+
 class Context:
     """类型上下文，用于存储变量的类型信息"""
+
+    # 所有上下文上 add_var 的总次数，扩展上下文据此判断祖先是否可能已改变
+    mutations = 0
     
     def __init__(self):
-        self.vars: Dict[str, Term] = {}
+        self.vars: MutableMapping[str, Term] = {}
+        # 每次add_var递增，用于判断依赖上下文内容的缓存是否过期
+        self.version = 0
         
     def add_var(self, name: str, type_: Term) -> None:
         """添加变量及其类型到上下文"""
         self.vars[name] = type_
+        self.version += 1
+        Context.mutations += 1
         
     def get_var_type(self, name: str) -> Optional[Term]:
         """获取变量的类型"""
+        if isinstance(self.vars, ChainMap):
+            for layer in self.vars.maps:
+                if name in layer:
+                    return layer[name]
+            return None
         return self.vars.get(name)
         
     def has_var(self, name: str) -> bool:
@@ -20,12 +36,37 @@ class Context:
         return name in self.vars
         
     def extend(self, name: str, type_: Term) -> 'Context':
-        """创建一个新的扩展上下文"""
+        """创建一个新的扩展上下文，与原上下文共享全局条目而不复制
+
+        扩展上下文通常是原上下文的实时视图：之后对原上下文（或其祖先）调用
+        add_var 加入的条目在扩展上下文中同样可见。唯一的例外是层数超过
+        MAX_LAYERS 时的合并：合并复制了原上下文的局部层，此后只有根上下文
+        的新条目仍然可见。可以用 is_view_of 判断是否仍是实时视图。
+        依赖上下文内容的缓存不能只看扩展上下文自身的 version，还需要检查
+        Context.mutations。
+        """
         new_context = Context()
-        new_context.vars = self.vars.copy()
-        new_context.add_var(name, type_)
+        if not isinstance(self.vars, ChainMap):
+            new_context.vars = ChainMap({name: type_}, self.vars)
+        elif len(self.vars.maps) > MAX_LAYERS:
+            # 只合并绑定变量所在的局部层，底层的全局上下文仍然共享
+            local = {}
+            for layer in reversed(self.vars.maps[:-1]):
+                local.update(layer)
+            local[name] = type_
+            new_context.vars = ChainMap(local, self.vars.maps[-1])
+        else:
+            new_context.vars = self.vars.new_child({name: type_})
         return new_context
         
+    def is_view_of(self, other: 'Context') -> bool:
+        """是否直接扩展自other且仍共享other的所有层，即other之后加入的条目在这里可见"""
+        if not isinstance(self.vars, ChainMap):
+            return False
+        layers = other.vars.maps if isinstance(other.vars, ChainMap) else [other.vars]
+        shared = self.vars.maps[1:]
+        return len(shared) == len(layers) and all(a is b for a, b in zip(shared, layers))
+
     def __str__(self) -> str:
         """字符串表示"""
         items = [f"{name}: {type_}" for name, type_ in self.vars.items()]
@@ -5,5 +5,12 @@ Core functionality for type checking and evaluation
 from .evaluator import Evaluator
 from .normalizer import Normalizer
 from .checker import TypeChecker
+from .instrumentation import Instrumentation
+from .snapshot import save_snapshot, load_snapshot, SnapshotError
+from .stream import check_declarations, check_file, StreamStats
+from .incremental import IncrementalChecker, ResultStore
 
-__all__ = ['Evaluator', 'Normalizer', 'TypeChecker']
+__all__ = ['Evaluator', 'Normalizer', 'TypeChecker', 'Instrumentation',
+           'save_snapshot', 'load_snapshot', 'SnapshotError',
+           'check_declarations', 'check_file', 'StreamStats',
+           'IncrementalChecker', 'ResultStore']
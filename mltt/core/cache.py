@@ -0,0 +1,66 @@
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple
+
+
+@dataclass
+class CacheStats:
+    """缓存统计"""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+
+
+class IdentityCache:
+    """以对象身份为键的有界LRU缓存
+
+    项和值都是不可哈希的dataclass，因此以 id() 为键，并对键对象持有弱引用：
+    键对象被回收时对应条目立即删除，不会因 id 复用而返回错误结果。
+    但缓存的值可能引用自己的键（例如规范化得到的 NeutralValue.term 就是键本身），
+    这样的条目会让键一直存活到被LRU淘汰，因此内存上限由 maxsize 保证。
+    maxsize 为 0 时不缓存任何内容。
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self.entries: OrderedDict = OrderedDict()
+        self.stats = CacheStats()
+
+    def get(self, key: Tuple[Any, ...]) -> Optional[Any]:
+        """查找缓存，未命中时返回None"""
+        ids = tuple(id(obj) for obj in key)
+        entry = self.entries.get(ids)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        self.entries.move_to_end(ids)
+        self.stats.hits += 1
+        return entry[1]
+
+    def put(self, key: Tuple[Any, ...], value: Any) -> None:
+        """写入缓存，超出容量时淘汰最久未使用的条目"""
+        if self.maxsize <= 0:
+            return
+        ids = tuple(id(obj) for obj in key)
+        remove = lambda ref, ids=ids: self._discard(ids)
+        refs = [weakref.ref(obj, remove) for obj in key]
+        self.entries[ids] = (refs, value)
+        self.entries.move_to_end(ids)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.stats.evictions += 1
+        self.stats.size = len(self.entries)
+
+    def _discard(self, ids: Tuple[int, ...]) -> None:
+        if self.entries.pop(ids, None) is not None:
+            self.stats.size = len(self.entries)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self.entries.clear()
+        self.stats.size = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
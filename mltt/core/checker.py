@@ -12,10 +12,10 @@ class TypeError(Exception):
 class TypeChecker:
     """类型检查器"""
     
-    def __init__(self):
+    def __init__(self, cache_size: int = 4096):
         self.context = Context()
-        self.evaluator = Evaluator()
-        self.normalizer = Normalizer(self.evaluator)
+        self.evaluator = Evaluator(cache_size)
+        self.normalizer = Normalizer(self.evaluator, cache_size)
         
     def infer(self, term: Term) -> Term:
         """推导项的类型"""
@@ -38,7 +38,7 @@ class TypeChecker:
                 raise TypeError(f"参数类型必须是一个Universe: {term.var_type}")
                 
             # 在扩展的上下文中检查返回类型
-            extended_context = self.context.extend(term.var_name, term.var_type)
+            extended_context = self.extend_context(term.var_name, term.var_type)
             with self.in_context(extended_context):
                 return_type_type = self.infer(term.body)
                 return_type_value = self.normalizer.normalize(return_type_type)
@@ -76,28 +76,42 @@ class TypeChecker:
         """检查项是否具有预期类型"""
         # 特殊处理Universe的情况
         if isinstance(term, Universe):
-            if not isinstance(expected_type, Universe):
-                raise TypeError(f"类型宇宙必须是另一个类型宇宙的类型: {term}")
-            if term.level >= expected_type.level:
-                raise TypeError(f"类型宇宙层级错误: Type_{term.level} 不能是 Type_{expected_type.level} 的类型")
-            return True
+            return self.check_valid(term, expected_type)
 
         # 首先检查expected_type是否是一个有效的类型
+        self.validate_type(expected_type)
+        return self.check_valid(term, expected_type)
+
+    def validate_type(self, type_: Term) -> None:
+        """检查type_是否是一个有效的类型"""
         try:
-            type_type = self.infer(expected_type)
+            type_type = self.infer(type_)
             if not isinstance(self.normalizer.normalize(type_type), UniverseValue):
-                raise TypeError(f"期望的类型 {expected_type} 不是一个有效的类型")
+                raise TypeError(f"期望的类型 {type_} 不是一个有效的类型")
         except TypeError as e:
             raise TypeError(f"无效的类型: {e}")
 
+    def check_valid(self, term: Term, expected_type: Term) -> bool:
+        """检查项是否具有预期类型，expected_type必须已经通过validate_type验证
+
+        有效Pi类型的返回类型在扩展的上下文中也是有效的，因此检查Lambda体时
+        不再重复验证，检查n层Lambda的时间与项的大小成线性关系。
+        """
+        if isinstance(term, Universe):
+            if not isinstance(expected_type, Universe):
+                raise TypeError(f"类型宇宙必须是另一个类型宇宙的类型: {term}")
+            if term.level >= expected_type.level:
+                raise TypeError(f"类型宇宙层级错误: Type_{term.level} 不能是 Type_{expected_type.level} 的类型")
+            return True
+
         if isinstance(term, Lambda):
             if not isinstance(expected_type, Pi):
                 raise TypeError("Lambda表达式的类型必须是Pi类型")
             
             # 检查Lambda表达式
-            extended_context = self.context.extend(expected_type.var_name, expected_type.var_type)
+            extended_context = self.extend_context(expected_type.var_name, expected_type.var_type)
             with self.in_context(extended_context):
-                if not self.check(term.body, expected_type.body):
+                if not self.check_valid(term.body, expected_type.body):
                     raise TypeError(f"Lambda体类型不匹配: 期望 {expected_type.body}")
             return True
             
@@ -120,26 +134,32 @@ class TypeChecker:
         n2 = self.normalizer.normalize(t2)
         return self.values_equal(n1, n2)
         
-    def values_equal(self, v1: Value, v2: Value) -> bool:
-        """比较两个值是否相等"""
+    def values_equal(self, v1: Value, v2: Value, level: int = 0) -> bool:
+        """比较两个值是否相等，level是当前所在闭包的嵌套层数"""
         if isinstance(v1, UniverseValue) and isinstance(v2, UniverseValue):
             return v1.level == v2.level
             
         elif isinstance(v1, VarValue) and isinstance(v2, VarValue):
             return v1.name == v2.name
+
+        elif isinstance(v1, FreshValue) and isinstance(v2, FreshValue):
+            return v1.level == v2.level
             
         elif isinstance(v1, ClosureValue) and isinstance(v2, ClosureValue):
-            # 比较闭包的结构
-            return (v1.var_name == v2.var_name and 
-                   self.values_equal(self.evaluator.eval(v1.body), 
-                                   self.evaluator.eval(v2.body)))
+            # 将两个闭包应用到同一个新鲜变量上比较其结果
+            if v1.var_name != v2.var_name:
+                return False
+            var = self.evaluator.fresh_var(level)
+            return self.values_equal(self.evaluator.apply_closure(v1, var),
+                                     self.evaluator.apply_closure(v2, var),
+                                     level + 1)
                                    
         elif isinstance(v1, NeutralValue) and isinstance(v2, NeutralValue):
             if not isinstance(v1.term, type(v2.term)):
                 return False
             if len(v1.args) != len(v2.args):
                 return False
-            return all(self.values_equal(a1, a2) for a1, a2 in zip(v1.args, v2.args))
+            return all(self.values_equal(a1, a2, level) for a1, a2 in zip(v1.args, v2.args))
             
         return False
         
@@ -172,6 +192,17 @@ class TypeChecker:
             
         return term
         
+    def declare(self, name: str, type_: Term, term: Optional[Term] = None) -> None:
+        """检查声明并将其加入上下文"""
+        self.validate_type(type_)
+        if term is not None:
+            self.check_valid(term, type_)
+        self.context.add_var(name, type_)
+        
+    def extend_context(self, name: str, type_: Term) -> Context:
+        """以当前上下文为基础创建扩展上下文"""
+        return self.context.extend(name, type_)
+        
     def in_context(self, new_context):
         """上下文管理器"""
         class ContextManager:
@@ -1,9 +1,14 @@
 from ..syntax.terms import *
 from ..syntax.values import *
+from .cache import IdentityCache
 
 class Evaluator:
-    def __init__(self):
+    def __init__(self, cache_size: int = 4096):
         self.env = {}
+        # (闭包, 参数) -> 应用结果
+        self.apply_cache = IdentityCache(cache_size)
+        # 按层级缓存的新鲜变量，同一层级总是同一个对象以便命中应用缓存
+        self.fresh_values = []
 
     def eval(self, term: Term) -> Value:
         """求值一个项"""
@@ -21,17 +26,31 @@ class Evaluator:
             arg_val = self.eval(term.arg)
             
             if isinstance(func_val, ClosureValue):
-                # 应用闭包
-                new_env = func_val.env.copy()
-                new_env[func_val.var_name] = arg_val
-                with self.in_env(new_env):
-                    return self.eval(func_val.body)
+                return self.apply_closure(func_val, arg_val)
             else:
                 # 构建中性值
                 return NeutralValue(term, [arg_val])
                 
         return NeutralValue(term, [])
 
+    def apply_closure(self, closure: ClosureValue, arg: Value) -> Value:
+        """应用闭包"""
+        key = (closure, arg)
+        result = self.apply_cache.get(key)
+        if result is None:
+            new_env = closure.env.copy()
+            new_env[closure.var_name] = arg
+            with self.in_env(new_env):
+                result = self.eval(closure.body)
+            self.apply_cache.put(key, result)
+        return result
+
+    def fresh_var(self, level: int) -> FreshValue:
+        """返回第level层的新鲜变量"""
+        while len(self.fresh_values) <= level:
+            self.fresh_values.append(FreshValue(len(self.fresh_values)))
+        return self.fresh_values[level]
+
     def in_env(self, new_env):
         """环境管理器"""
         class EnvManager:
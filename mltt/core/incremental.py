@@ -0,0 +1,143 @@
+import hashlib
+import weakref
+from collections import OrderedDict
+from itertools import islice
+from typing import Any, Callable, Optional, Tuple
+from ..syntax.terms import *
+from ..context import Context
+from .cache import CacheStats
+from .checker import TypeChecker, TypeError
+
+# 空上下文的哈希
+EMPTY_CONTEXT_HASH = hashlib.blake2b(b"Context", digest_size=16).digest()
+
+
+def extend_hash(context_hash: bytes, name: str, type_: Term) -> bytes:
+    """在哈希为context_hash的上下文中加入 name : type_ 后的哈希"""
+    h = hashlib.blake2b(context_hash, digest_size=16)
+    encoded = name.encode()
+    h.update(len(encoded).to_bytes(4, "big"))
+    h.update(encoded)
+    h.update(type_.merkle_hash())
+    return h.digest()
+
+
+class ResultStore:
+    """以 (项哈希, 上下文哈希) 为键保存推导结果或类型错误的有界LRU存储
+
+    键只包含内容哈希，不引用项本身，因此可以在多次提交之间长期保留。
+    """
+
+    def __init__(self, maxsize: int = 1 << 20):
+        self.maxsize = maxsize
+        self.entries: OrderedDict = OrderedDict()
+        self.stats = CacheStats()
+
+    def get(self, key: Tuple[bytes, ...]) -> Optional[Tuple[bool, Any]]:
+        """返回 (是否成功, 结果或错误信息)，未命中时返回None"""
+        result = self.entries.get(key)
+        if result is None:
+            self.stats.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.stats.hits += 1
+        return result
+
+    def put(self, key: Tuple[bytes, ...], result: Tuple[bool, Any]) -> None:
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.stats.evictions += 1
+        self.stats.size = len(self.entries)
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.stats.size = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+class IncrementalChecker(TypeChecker):
+    """增量类型检查器
+
+    infer 和 check_valid 的结果按 (项的Merkle哈希, 上下文哈希) 保存在 store 中。
+    重新提交局部修改过的项时，未改变的子项直接命中，只有从修改处到根的
+    路径需要重新检查。
+    """
+
+    def __init__(self, store: Optional[ResultStore] = None, cache_size: int = 4096):
+        super().__init__(cache_size)
+        self.store = store if store is not None else ResultStore()
+        # 上下文 -> (版本, 条目数, 哈希, 计算时的 Context.mutations)
+        self.context_hashes = weakref.WeakKeyDictionary()
+        # 仍是原上下文实时视图的扩展上下文 -> (原上下文, 名字, 类型, 创建时的版本)
+        self.parents = weakref.WeakKeyDictionary()
+
+    def context_hash(self, context: Optional[Context] = None) -> bytes:
+        """上下文的哈希，默认为当前上下文，按条目顺序折叠计算
+
+        扩展上下文是原上下文的实时视图，祖先上下文加入新条目后它的哈希
+        也会改变，因此只有在没有任何上下文被修改过时才直接使用缓存的哈希。
+        """
+        if context is None:
+            context = self.context
+        vars = context.vars
+        entry = self.context_hashes.get(context)
+        if (entry is not None and entry[0] == context.version
+                and (isinstance(vars, dict) or entry[3] == Context.mutations)):
+            return entry[2]
+        parent = self.parents.get(context)
+        if parent is not None and parent[3] == context.version:
+            # 自身没有被修改过，由原上下文的哈希重新得到
+            digest = extend_hash(self.context_hash(parent[0]), parent[1], parent[2])
+        elif (entry is not None and entry[1] is not None and isinstance(vars, dict)
+                and context.version - entry[0] == len(vars) - entry[1]):
+            # 上次计算之后只追加了新条目
+            digest = entry[2]
+            added = list(islice(reversed(vars.items()), len(vars) - entry[1]))
+            for name, type_ in reversed(added):
+                digest = extend_hash(digest, name, type_)
+        else:
+            digest = EMPTY_CONTEXT_HASH
+            for name, type_ in vars.items():
+                digest = extend_hash(digest, name, type_)
+        count = len(vars) if isinstance(vars, dict) else None
+        self.context_hashes[context] = (context.version, count, digest, Context.mutations)
+        return digest
+
+    def extend_context(self, name: str, type_: Term) -> Context:
+        """扩展上下文，并由当前上下文的哈希直接得到新上下文的哈希"""
+        parent = self.context
+        digest = extend_hash(self.context_hash(parent), name, type_)
+        new_context = super().extend_context(name, type_)
+        if new_context.is_view_of(parent):
+            # 合并过局部层的上下文不再随原上下文变化，之后按实际可见的条目计算
+            self.parents[new_context] = (parent, name, type_, new_context.version)
+        self.context_hashes[new_context] = (new_context.version, None, digest, Context.mutations)
+        return new_context
+
+    def infer(self, term: Term) -> Term:
+        key = (b"infer", term.merkle_hash(), self.context_hash())
+        return self.cached(key, super().infer, term)
+
+    def check_valid(self, term: Term, expected_type: Term) -> bool:
+        key = (b"check", term.merkle_hash(), expected_type.merkle_hash(), self.context_hash())
+        return self.cached(key, super().check_valid, term, expected_type)
+
+    def cached(self, key: Tuple[bytes, ...], compute: Callable, *args):
+        """查找结果，未命中时计算并保存结果或类型错误"""
+        result = self.store.get(key)
+        if result is None:
+            try:
+                value = compute(*args)
+            except TypeError as e:
+                self.store.put(key, (False, str(e)))
+                raise
+            self.store.put(key, (True, value))
+            return value
+        ok, value = result
+        if not ok:
+            raise TypeError(value)
+        return value
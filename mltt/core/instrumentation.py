@@ -0,0 +1,169 @@
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
+from collections import ChainMap
+from ..syntax.values import *
+from ..context import Context, MAX_LAYERS
+
+# 被插桩的方法：(属性名, 操作名)
+CHECKER_OPS = [
+    ("infer", "infer"),
+    ("check", "check"),
+    ("check_valid", "check_valid"),
+    ("validate_type", "validate_type"),
+    ("is_equal", "is_equal"),
+    ("substitute", "substitute"),
+    ("extend_context", "context_extend"),
+]
+EVALUATOR_OPS = [
+    ("eval", "eval"),
+    ("apply_closure", "apply_closure"),
+]
+NORMALIZER_OPS = [
+    ("normalize", "normalize"),
+]
+# 操作的种类取自哪个位置参数，默认为第一个；extend_context 的第一个参数是绑定名
+KIND_ARGS = {
+    "context_extend": 1,
+}
+
+# tracer(event, op, kind, depth)，event 为 "enter" 或 "exit"
+Tracer = Callable[[str, str, str, int], None]
+
+
+def value_size(value: Value) -> int:
+    """值的节点个数（闭包体不展开）"""
+    if isinstance(value, NeutralValue):
+        return 1 + sum(value_size(arg) for arg in value.args)
+    return 1
+
+
+def merged_entries(context: Context) -> int:
+    """扩展该上下文时需要合并复制的条目数，未达到层数上限时为0"""
+    vars = context.vars
+    if isinstance(vars, ChainMap) and len(vars.maps) > MAX_LAYERS:
+        return sum(len(layer) for layer in vars.maps[:-1])
+    return 0
+
+
+class Instrumentation:
+    """类型检查器、求值器和规范化器的可选插桩
+
+    attach 时用实例属性覆盖被插桩的方法，detach 时删除这些属性，
+    因此未启用插桩时热路径上没有任何额外开销。
+    """
+
+    def __init__(self, tracer: Optional[Tracer] = None, clock=time.perf_counter):
+        self.tracer = tracer
+        self.clock = clock
+        self.attached: List[Tuple[object, str]] = []
+        self.reset()
+
+    def reset(self) -> None:
+        """清空所有统计数据"""
+        self.counters: Dict[str, int] = defaultdict(int)
+        self.total_time: Dict[str, float] = defaultdict(float)
+        self.self_time: Dict[str, float] = defaultdict(float)
+        self.stacks: Dict[str, float] = defaultdict(float)
+        # 调用栈帧：[操作名, 开始时间, 子调用耗时]
+        self.stack: List[list] = []
+
+    def attach(self, checker) -> 'Instrumentation':
+        """对检查器及其求值器、规范化器插桩，可作为上下文管理器使用"""
+        self._patch(checker, CHECKER_OPS)
+        self._patch(checker.evaluator, EVALUATOR_OPS)
+        self._patch(checker.normalizer, NORMALIZER_OPS)
+        return self
+
+    def detach(self) -> None:
+        """恢复原始方法"""
+        for obj, name in self.attached:
+            del obj.__dict__[name]
+        self.attached = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.detach()
+
+    def _patch(self, obj, ops) -> None:
+        for name, op in ops:
+            if name in obj.__dict__:
+                raise RuntimeError(f"{type(obj).__name__}.{name} 已经被插桩")
+            method = getattr(obj, name)
+            setattr(obj, name, self._wrap(obj, op, method))
+            self.attached.append((obj, name))
+
+    def _wrap(self, obj, op: str, method):
+        index = KIND_ARGS.get(op, 0)
+
+        def wrapper(*args, **kwargs):
+            kind = type(args[index]).__name__ if len(args) > index else ""
+            self.enter(op, kind)
+            if op == "context_extend":
+                self.counters["context_extend_merged"] += merged_entries(obj.context)
+            try:
+                result = method(*args, **kwargs)
+            finally:
+                self.exit(op, kind)
+            if op == "normalize":
+                self.counters["normalize_size"] += value_size(result)
+            return result
+        return wrapper
+
+    def enter(self, op: str, kind: str) -> None:
+        """记录一次操作的开始"""
+        self.counters[op] += 1
+        if self.tracer is not None:
+            self.tracer("enter", op, kind, len(self.stack))
+        self.stack.append([op, self.clock(), 0.0])
+
+    def exit(self, op: str, kind: str) -> None:
+        """记录一次操作的结束"""
+        frame = self.stack.pop()
+        elapsed = self.clock() - frame[1]
+        own = elapsed - frame[2]
+        if self.stack:
+            self.stack[-1][2] += elapsed
+        # 递归调用只在最外层计入总耗时
+        if all(f[0] != op for f in self.stack):
+            self.total_time[op] += elapsed
+        self.self_time[op] += own
+        path = ";".join([f[0] for f in self.stack] + [op])
+        self.stacks[path] += own
+        if self.tracer is not None:
+            self.tracer("exit", op, kind, len(self.stack))
+
+    def report(self) -> Dict[str, dict]:
+        """导出计数器和计时器"""
+        return {
+            "counters": dict(self.counters),
+            "timers": {
+                op: {"total": self.total_time[op], "self": self.self_time[op]}
+                for op in self.self_time
+            },
+        }
+
+    def format_report(self) -> str:
+        """以文本表格形式输出报告"""
+        lines = [f"{'operation':<20}{'calls':>10}{'total(ms)':>12}{'self(ms)':>12}"]
+        for op in sorted(self.self_time, key=self.self_time.get, reverse=True):
+            lines.append(f"{op:<20}{self.counters[op]:>10}"
+                         f"{self.total_time[op] * 1000:>12.3f}{self.self_time[op] * 1000:>12.3f}")
+        for name in ("context_extend_merged", "normalize_size"):
+            if name in self.counters:
+                lines.append(f"{name:<20}{self.counters[name]:>10}")
+        return "\n".join(lines)
+
+    def collapsed_stacks(self) -> str:
+        """输出 flamegraph.pl 可用的折叠栈格式（单位：微秒）"""
+        lines = []
+        for path, seconds in sorted(self.stacks.items()):
+            lines.append(f"{path} {int(round(seconds * 1e6))}")
+        return "\n".join(lines)
+
+    def write_collapsed_stacks(self, path: str) -> None:
+        """将折叠栈写入文件"""
+        with open(path, "w") as f:
+            f.write(self.collapsed_stacks() + "\n")
@@ -1,16 +1,26 @@
 from ..syntax.terms import Term
 from ..syntax.values import Value
 from .evaluator import Evaluator
+from .cache import IdentityCache
 
 class Normalizer:
     """规范化器，用于将项规范化为值"""
     
-    def __init__(self, evaluator: Evaluator):
+    def __init__(self, evaluator: Evaluator, cache_size: int = 4096):
         self.evaluator = evaluator
+        # 项 -> 规范形式，只缓存在空环境中的结果
+        self.cache = IdentityCache(cache_size)
         
     def normalize(self, term: Term) -> Value:
         """将项规范化为值"""
-        return self.evaluator.eval(term)
+        if self.evaluator.env:
+            return self.evaluator.eval(term)
+        key = (term,)
+        value = self.cache.get(key)
+        if value is None:
+            value = self.evaluator.eval(term)
+            self.cache.put(key, value)
+        return value
         
     def fresh_name(self, base: str) -> str:
         """生成新的变量名"""
@@ -0,0 +1,163 @@
+import hashlib
+import json
+import struct
+import zlib
+from typing import Dict, List, Tuple
+from ..syntax.terms import *
+from ..context import Context
+from .checker import TypeChecker
+from .incremental import IncrementalChecker, ResultStore
+
+MAGIC = b"MLTTSNAP"
+# 版本2增加了增量检查器的结果存储
+VERSION = 2
+# 文件头：魔数、格式版本、负载的SHA-256摘要
+HEADER = struct.Struct(f">{len(MAGIC)}sH32s")
+
+
+class SnapshotError(Exception):
+    """快照格式或完整性错误"""
+    pass
+
+
+class TermTable:
+    """结构共享的项表，相同结构的子项只编码一次"""
+
+    def __init__(self):
+        self.nodes: List[list] = []
+        self.index: Dict[tuple, int] = {}
+
+    def add(self, term: Term) -> int:
+        """将项加入表中并返回其编号"""
+        if isinstance(term, Var):
+            node = ["V", term.name]
+        elif isinstance(term, Universe):
+            node = ["U", term.level]
+        elif isinstance(term, Pi):
+            node = ["P", term.var_name, self.add(term.var_type), self.add(term.body)]
+        elif isinstance(term, Lambda):
+            node = ["L", term.var_name, self.add(term.var_type), self.add(term.body)]
+        elif isinstance(term, App):
+            node = ["A", self.add(term.func), self.add(term.arg)]
+        else:
+            raise SnapshotError(f"无法序列化的项: {term}")
+        key = tuple(node)
+        if key not in self.index:
+            self.index[key] = len(self.nodes)
+            self.nodes.append(node)
+        return self.index[key]
+
+
+def term_at(terms: List[Term], index) -> Term:
+    """按编号取出已解码的项，编号必须指向之前的项"""
+    if not isinstance(index, int) or not 0 <= index < len(terms):
+        raise SnapshotError(f"无效的项编号: {index!r}")
+    return terms[index]
+
+
+def decode_terms(nodes: List[list]) -> List[Term]:
+    """按编号顺序重建项，子项总是先于父项出现"""
+    terms: List[Term] = []
+    for node in nodes:
+        tag = node[0]
+        if tag == "V":
+            terms.append(Var(node[1]))
+        elif tag == "U":
+            terms.append(Universe(node[1]))
+        elif tag == "P":
+            terms.append(Pi(node[1], term_at(terms, node[2]), term_at(terms, node[3])))
+        elif tag == "L":
+            terms.append(Lambda(node[1], term_at(terms, node[2]), term_at(terms, node[3])))
+        elif tag == "A":
+            terms.append(App(term_at(terms, node[1]), term_at(terms, node[2])))
+        else:
+            raise SnapshotError(f"未知的项标记: {tag}")
+    return terms
+
+
+def encode_results(store: ResultStore, table: TermTable) -> List[list]:
+    """按LRU顺序编码结果存储：[键的十六进制各部分, 标记, 数据]"""
+    results = []
+    for key, (ok, value) in store.entries.items():
+        parts = [part.hex() for part in key]
+        if not ok:
+            results.append([parts, "E", value])
+        elif isinstance(value, Term):
+            results.append([parts, "T", table.add(value)])
+        else:
+            results.append([parts, "B", bool(value)])
+    return results
+
+
+def decode_results(results: List[list], terms: List[Term], store: ResultStore) -> None:
+    """将编码的结果按原顺序放回存储"""
+    for parts, tag, data in results:
+        key = tuple(bytes.fromhex(part) for part in parts)
+        if tag == "E":
+            store.put(key, (False, data))
+        elif tag == "T":
+            store.put(key, (True, term_at(terms, data)))
+        elif tag == "B":
+            store.put(key, (True, data))
+        else:
+            raise SnapshotError(f"未知的结果标记: {tag}")
+
+
+def dumps(checker: TypeChecker) -> bytes:
+    """将检查器的上下文序列化为快照，增量检查器还会保存其结果存储"""
+    table = TermTable()
+    context = [[name, table.add(type_)] for name, type_ in checker.context.vars.items()]
+    payload = {"context": context}
+    if isinstance(checker, IncrementalChecker):
+        payload["results"] = encode_results(checker.store, table)
+    payload["terms"] = table.nodes
+    body = zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+    return HEADER.pack(MAGIC, VERSION, hashlib.sha256(body).digest()) + body
+
+
+def loads(data: bytes) -> TypeChecker:
+    """从快照恢复检查器，快照中的声明不再重新检查
+
+    快照来自增量检查器时恢复为 IncrementalChecker，并预先填入保存的结果，
+    未修改的项在新进程中也能直接命中。
+    """
+    if len(data) < HEADER.size:
+        raise SnapshotError("快照文件被截断")
+    magic, version, digest = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SnapshotError("不是MLTT快照文件")
+    if version != VERSION:
+        raise SnapshotError(f"不支持的快照版本: {version}，当前版本 {VERSION}")
+    body = data[HEADER.size:]
+    if hashlib.sha256(body).digest() != digest:
+        raise SnapshotError("快照校验失败，文件可能已损坏")
+    # 摘要只能发现损坏，不能保证写入方生成了合法的结构
+    try:
+        payload = json.loads(zlib.decompress(body).decode("utf-8"))
+        terms = decode_terms(payload["terms"])
+        context = Context()
+        for name, index in payload["context"]:
+            context.add_var(name, term_at(terms, index))
+        if "results" in payload:
+            store = ResultStore()
+            store.maxsize = max(store.maxsize, len(payload["results"]))
+            decode_results(payload["results"], terms, store)
+            checker = IncrementalChecker(store)
+        else:
+            checker = TypeChecker()
+    except (KeyError, IndexError, TypeError, ValueError, zlib.error) as e:
+        raise SnapshotError(f"快照结构无效: {e!r}") from e
+    checker.context = context
+    return checker
+
+
+def save_snapshot(checker: TypeChecker, path: str) -> None:
+    """将检查器状态写入文件"""
+    with open(path, "wb") as f:
+        f.write(dumps(checker))
+
+
+def load_snapshot(path: str) -> TypeChecker:
+    """从文件恢复检查器状态"""
+    with open(path, "rb") as f:
+        return loads(f.read())
@@ -0,0 +1,50 @@
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional
+from ..syntax.parser import Declaration, parse_file
+from .checker import TypeChecker, TypeError
+
+
+@dataclass
+class StreamStats:
+    """流式检查的吞吐量统计"""
+    declarations: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        """每秒检查的声明数"""
+        return self.declarations / self.seconds if self.seconds > 0 else 0.0
+
+    def __str__(self):
+        return f"{self.declarations} declarations in {self.seconds:.3f}s ({self.rate:.0f} decl/s)"
+
+
+def check_declarations(declarations: Iterable[Declaration],
+                       checker: Optional[TypeChecker] = None,
+                       progress: Optional[Callable[[StreamStats], None]] = None,
+                       report_every: int = 10000) -> StreamStats:
+    """逐个检查声明，每解析出一个声明就立即交给检查器
+
+    每检查report_every个声明调用一次progress，report_every小于1时不报告进度。
+    """
+    if checker is None:
+        checker = TypeChecker()
+    stats = StreamStats()
+    start = time.perf_counter()
+    for decl in declarations:
+        try:
+            checker.declare(decl.name, decl.type, decl.term)
+        except TypeError as e:
+            raise TypeError(f"第{decl.line}行 {decl.name}: {e}") from e
+        stats.declarations += 1
+        if progress is not None and report_every > 0 and stats.declarations % report_every == 0:
+            stats.seconds = time.perf_counter() - start
+            progress(stats)
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
+def check_file(path: str, checker: Optional[TypeChecker] = None, **kwargs) -> StreamStats:
+    """流式解析并检查文件"""
+    return check_declarations(parse_file(path), checker, **kwargs)
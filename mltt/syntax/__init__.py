@@ -3,5 +3,7 @@ Martin-Löf Type Theory syntax module.
 """
 
 from .terms import Var, Universe, Pi, Lambda, App, Term
+from .parser import ParseError, Declaration, parse_term, parse_declarations, parse_file
 
-__all__ = ['Var', 'Universe', 'Pi', 'Lambda', 'App', 'Term'] 
\ No newline at end of file
+__all__ = ['Var', 'Universe', 'Pi', 'Lambda', 'App', 'Term',
+           'ParseError', 'Declaration', 'parse_term', 'parse_declarations', 'parse_file'] 
\ No newline at end of file
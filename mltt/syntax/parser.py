@@ -0,0 +1,218 @@
+import re
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional, Tuple
+from .terms import *
+
+SUBSCRIPTS = "₀₁₂₃₄₅₆₇₈₉"
+
+# 词法单元的种类
+IDENT = "IDENT"
+TYPE = "TYPE"
+PI = "Π"
+LAMBDA = "λ"
+LPAREN = "("
+RPAREN = ")"
+COLON = ":"
+DOT = "."
+DEFINE = ":="
+EOF = "EOF"
+
+# Π 和 λ 是保留字符，不能出现在标识符中
+TOKEN_RE = re.compile(r"""
+    (?P<space>\s+|--[^\n]*)
+  | (?P<type>Type(?:_(?P<level>\d+)|(?P<sub>[₀-₉]+))(?![\w']))
+  | (?P<ident>(?:(?![Πλ])[^\W\d])(?:(?![Πλ])[\w'])*)
+  | (?P<define>:=)
+  | (?P<punct>[Πλ():.])
+""", re.VERBOSE)
+
+# (种类, 值, 行号)
+Token = Tuple[str, object, int]
+
+
+class ParseError(Exception):
+    """语法错误"""
+
+    def __init__(self, message: str, line: int):
+        super().__init__(f"第{line}行: {message}")
+        self.line = line
+
+
+@dataclass
+class Declaration:
+    """顶层声明 name : type [:= term]"""
+    name: str
+    type: Term
+    term: Optional[Term]
+    line: int
+
+
+def tokenize(chunks: Iterable[str]) -> Iterator[Token]:
+    """对文本块流进行词法分析，只保留尚未完成的最后一个词法单元"""
+    buffer = ""
+    line = 1
+    chunks = iter(chunks)
+    final = False
+    while not final:
+        chunk = next(chunks, None)
+        if chunk is None:
+            final = True
+        else:
+            buffer += chunk
+        pos = 0
+        end = len(buffer)
+        match = TOKEN_RE.match
+        while pos < end:
+            m = match(buffer, pos)
+            if m is None:
+                # 单独的 "-" 可能是被切开的注释开头
+                if buffer[pos:] == "-" and not final:
+                    break
+                raise ParseError(f"无法识别的字符: {buffer[pos]!r}", line)
+            # 到达缓冲区末尾的词法单元可能还没读完
+            if m.end() == end and not final:
+                break
+            kind = m.lastgroup
+            if kind == "space":
+                line += buffer.count("\n", pos, m.end())
+            elif kind == "ident":
+                yield (IDENT, m.group(), line)
+            elif kind == "type":
+                digits = m.group("level")
+                if digits is None:
+                    digits = "".join(str(SUBSCRIPTS.index(c)) for c in m.group("sub"))
+                yield (TYPE, int(digits), line)
+            else:
+                yield (m.group(), None, line)
+            pos = m.end()
+        buffer = buffer[pos:]
+    yield (EOF, None, line)
+
+
+class Parser:
+    """手写的递归下降语法分析器，按需从词法单元流中读取"""
+
+    def __init__(self, tokens: Iterable[Token]):
+        self.tokens = iter(tokens)
+        self.current = next(self.tokens)
+        self.lookahead: Optional[Token] = None
+
+    def advance(self) -> Token:
+        token = self.current
+        if self.lookahead is not None:
+            self.current, self.lookahead = self.lookahead, None
+        else:
+            self.current = next(self.tokens)
+        return token
+
+    def peek(self) -> Token:
+        """查看当前词法单元之后的一个词法单元"""
+        if self.lookahead is None:
+            self.lookahead = next(self.tokens)
+        return self.lookahead
+
+    def expect(self, kind: str) -> Token:
+        if self.current[0] != kind:
+            raise ParseError(f"期望 {kind}，实际 {self.describe(self.current)}", self.current[2])
+        return self.advance()
+
+    @staticmethod
+    def describe(token: Token) -> str:
+        if token[0] == IDENT:
+            return repr(token[1])
+        if token[0] == TYPE:
+            return f"Type_{token[1]}"
+        return token[0]
+
+    def declarations(self) -> Iterator[Declaration]:
+        """逐个产生顶层声明"""
+        while self.current[0] != EOF:
+            yield self.declaration()
+
+    def declaration(self) -> Declaration:
+        line = self.current[2]
+        name = self.expect(IDENT)[1]
+        self.expect(COLON)
+        type_ = self.term()
+        term = None
+        if self.current[0] == DEFINE:
+            self.advance()
+            term = self.term()
+        return Declaration(name, type_, term, line)
+
+    def term(self) -> Term:
+        # 绑定子序列迭代处理，避免长的Π/λ链导致递归过深
+        binders = []
+        while self.current[0] in (PI, LAMBDA):
+            kind = self.advance()[0]
+            self.expect(LPAREN)
+            var_name = self.expect(IDENT)[1]
+            self.expect(COLON)
+            var_type = self.term()
+            self.expect(RPAREN)
+            self.expect(DOT)
+            binders.append((kind, var_name, var_type))
+        result = self.application()
+        for kind, var_name, var_type in reversed(binders):
+            if kind == PI:
+                result = Pi(var_name, var_type, result)
+            else:
+                result = Lambda(var_name, var_type, result)
+        return result
+
+    def application(self) -> Term:
+        result = self.atom()
+        while self.starts_atom():
+            result = App(result, self.atom())
+        return result
+
+    def starts_atom(self) -> bool:
+        kind = self.current[0]
+        if kind == IDENT:
+            # "name :" 在顶层只能是下一个声明的开头
+            return self.peek()[0] != COLON
+        return kind in (TYPE, LPAREN)
+
+    def atom(self) -> Term:
+        token = self.current
+        if token[0] == IDENT:
+            self.advance()
+            return Var(token[1])
+        elif token[0] == TYPE:
+            self.advance()
+            return Universe(token[1])
+        elif token[0] == LPAREN:
+            self.advance()
+            result = self.term()
+            self.expect(RPAREN)
+            return result
+        raise ParseError(f"期望一个项，实际 {self.describe(token)}", token[2])
+
+
+def read_chunks(file, chunk_size: int = 1 << 16) -> Iterator[str]:
+    """按块读取文本文件"""
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def parse_term(text: str) -> Term:
+    """解析单个项"""
+    parser = Parser(tokenize([text]))
+    result = parser.term()
+    if parser.current[0] != EOF:
+        raise ParseError(f"多余的输入: {parser.describe(parser.current)}", parser.current[2])
+    return result
+
+
+def parse_declarations(chunks: Iterable[str]) -> Iterator[Declaration]:
+    """从文本块流中逐个解析声明"""
+    return Parser(tokenize(chunks)).declarations()
+
+
+def parse_file(path: str, chunk_size: int = 1 << 16) -> Iterator[Declaration]:
+    """流式解析文件中的声明，文件开头的UTF-8 BOM会被忽略"""
+    with open(path, encoding="utf-8-sig") as f:
+        yield from parse_declarations(read_chunks(f, chunk_size))
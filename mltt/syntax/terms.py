@@ -1,10 +1,28 @@
+import hashlib
 from dataclasses import dataclass
-from typing import Union
+from typing import List, Union
 
 @dataclass
 class Term:
     """基础项类型"""
-    pass
+
+    def merkle_hash(self) -> bytes:
+        """内容（Merkle）哈希：由节点种类、字段和子项的哈希计算，结果缓存在节点上
+
+        项在构造后不应再被修改，否则缓存的哈希会过期。
+        """
+        digest = self.__dict__.get("_merkle")
+        if digest is None:
+            h = hashlib.blake2b(type(self).__name__.encode(), digest_size=16)
+            for part in self.merkle_parts():
+                h.update(len(part).to_bytes(4, "big"))
+                h.update(part)
+            digest = self._merkle = h.digest()
+        return digest
+
+    def merkle_parts(self) -> List[bytes]:
+        """参与哈希计算的内容；未知的节点种类按其repr计算，交由检查器报告错误"""
+        return [repr(self).encode()]
 
 @dataclass
 class Var(Term):
@@ -14,6 +32,9 @@ class Var(Term):
     def __str__(self):
         return self.name
 
+    def merkle_parts(self):
+        return [self.name.encode()]
+
 @dataclass
 class Universe(Term):
     """Universe类型 (Type_n)"""
@@ -22,6 +43,9 @@ class Universe(Term):
     def __str__(self):
         return f"Type₀" if self.level == 0 else f"Type_{self.level}"
 
+    def merkle_parts(self):
+        return [str(self.level).encode()]
+
 @dataclass
 class Pi(Term):
     """依赖函数类型 (Π)"""
@@ -32,6 +56,9 @@ class Pi(Term):
     def __str__(self):
         return f"Π ({self.var_name} : {self.var_type}). {self.body}"
 
+    def merkle_parts(self):
+        return [self.var_name.encode(), self.var_type.merkle_hash(), self.body.merkle_hash()]
+
 @dataclass
 class Lambda(Term):
     """Lambda抽象"""
@@ -42,6 +69,9 @@ class Lambda(Term):
     def __str__(self):
         return f"λ ({self.var_name} : {self.var_type}). {self.body}"
 
+    def merkle_parts(self):
+        return [self.var_name.encode(), self.var_type.merkle_hash(), self.body.merkle_hash()]
+
 @dataclass
 class App(Term):
     """函数应用"""
@@ -49,4 +79,10 @@ class App(Term):
     arg: 'Term'
 
     def __str__(self):
-        return f"{self.func} {self.arg}" 
\ No newline at end of file
+        # 应用左结合，Π/λ 向右延伸到最远处，必要时加括号以便重新解析
+        func = f"({self.func})" if isinstance(self.func, (Pi, Lambda)) else str(self.func)
+        arg = f"({self.arg})" if isinstance(self.arg, (Pi, Lambda, App)) else str(self.arg)
+        return f"{func} {arg}"
+
+    def merkle_parts(self):
+        return [self.func.merkle_hash(), self.arg.merkle_hash()] 
\ No newline at end of file
@@ -15,6 +15,14 @@ class VarValue(Value):
     def __str__(self):
         return self.name
 
+@dataclass
+class FreshValue(Value):
+    """比较闭包时使用的新鲜变量（按嵌套层级编号），不会与任何具名变量相等"""
+    level: int
+
+    def __str__(self):
+        return f"#{self.level}"
+
 @dataclass
 class UniverseValue(Value):
     """Universe值"""
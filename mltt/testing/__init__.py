@@ -0,0 +1,7 @@
+"""
+Random generation of well-typed terms for property tests and benchmarks
+"""
+
+from .generators import TermGenerator, WellTypedTerm, generate_corpus, term_size, term_depth
+
+__all__ = ['TermGenerator', 'WellTypedTerm', 'generate_corpus', 'term_size', 'term_depth']
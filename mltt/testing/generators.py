@@ -0,0 +1,378 @@
+import random
+from collections import ChainMap
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set
+
+from ..syntax.terms import *
+from ..context import Context
+
+
+@dataclass
+class WellTypedTerm:
+    """生成的样本：上下文、项及其类型"""
+    context: Context
+    term: Term
+    type: Term
+
+
+def term_size(term: Term) -> int:
+    """项的节点个数"""
+    if isinstance(term, (Pi, Lambda)):
+        return 1 + term_size(term.var_type) + term_size(term.body)
+    elif isinstance(term, App):
+        return 1 + term_size(term.func) + term_size(term.arg)
+    return 1
+
+
+def term_depth(term: Term) -> int:
+    """项的嵌套深度"""
+    if isinstance(term, (Pi, Lambda)):
+        return 1 + max(term_depth(term.var_type), term_depth(term.body))
+    elif isinstance(term, App):
+        return 1 + max(term_depth(term.func), term_depth(term.arg))
+    return 1
+
+
+def free_vars(term: Term) -> Set[str]:
+    """项中的自由变量"""
+    if isinstance(term, Var):
+        return {term.name}
+    elif isinstance(term, (Pi, Lambda)):
+        return free_vars(term.var_type) | (free_vars(term.body) - {term.var_name})
+    elif isinstance(term, App):
+        return free_vars(term.func) | free_vars(term.arg)
+    return set()
+
+
+def _entries(context: Context):
+    """上下文中可见的条目；直接合并各层字典，比逐个查找ChainMap快得多"""
+    vars = context.vars
+    if not isinstance(vars, ChainMap):
+        return vars.items()
+    merged = {}
+    for layer in reversed(vars.maps):
+        merged.update(layer)
+    return merged.items()
+
+
+class TermGenerator:
+    """类型导向的良类型项随机生成器
+
+    生成的项与 TypeChecker 的检查规则一致：Lambda 的绑定名与期望的
+    Pi 类型相同，Pi 类型的层级恰好等于期望的 Universe 层级，所有绑定名
+    都是新鲜的，因此替换不会发生变量捕获。
+
+    生成的项满足 term_size <= max_size 且 term_depth <= max_depth（从类型复制的
+    Lambda注解也计算在内）。每次 generate 的搜索步数不超过 max_steps，
+    每次尝试不超过其四分之一，因此耗时有上界；步数用尽时退回到 Type₀ : Type₁。
+
+    rng 可以是任何提供 random/randint/choice/shuffle 的对象，既可以是
+    random.Random，也可以是 Hypothesis 的 st.randoms()。
+    """
+
+    # 每一步最多尝试的消去候选数，限制回溯的分支数
+    MAX_CANDIDATES = 3
+
+    def __init__(self, rng=None, max_depth: int = 4, max_size: int = 64,
+                 max_level: int = 1, context_size: int = 4, type_depth: int = 2,
+                 max_steps: Optional[int] = None):
+        self.rng = rng if rng is not None else random.Random()
+        self.max_depth = max_depth
+        self.max_size = max_size
+        self.max_level = max_level
+        self.context_size = context_size
+        self.type_depth = type_depth
+        self.type_size = 2 ** (type_depth + 1) - 1
+        self.max_steps = max_steps if max_steps is not None else 100 + 20 * max_size
+        self.attempt_steps = max(1, self.max_steps // 4)
+        self.counter = 0
+        self.steps = self.max_steps
+
+    def fresh_name(self, base: str) -> str:
+        """生成新的变量名"""
+        self.counter += 1
+        return f"{base}{self.counter}"
+
+    def step(self) -> bool:
+        """消耗一步搜索预算，预算用尽时返回False"""
+        if self.steps <= 0:
+            return False
+        self.steps -= 1
+        return True
+
+    def generate(self, context: Optional[Context] = None) -> WellTypedTerm:
+        """生成一个良类型的项及其类型"""
+        if context is None:
+            context = self.gen_context(self.context_size)
+        # 每次尝试只能使用总预算的一部分，某个类型难以构造时尽早换一个类型
+        remaining = self.max_steps
+        while remaining > 0:
+            self.steps = min(remaining, self.attempt_steps)
+            budget = self.steps
+            level = self.rng.randint(0, self.max_level)
+            type_ = self.gen_type(context, level, self.type_size, self.type_depth + 1)
+            term = None
+            if type_ is not None:
+                term = self.gen_term(context, type_, self.max_size, self.max_depth)
+            remaining -= budget - self.steps
+            if term is not None:
+                return WellTypedTerm(context, term, type_)
+        # Type₀ : Type₁ 总是成立
+        return WellTypedTerm(context, Universe(0), Universe(1))
+
+    def gen_context(self, size: int) -> Context:
+        """生成一个良构的上下文，包含类型变量和它们的居留元"""
+        context = Context()
+        context.add_var(self.fresh_name("A"), Universe(0))
+        while len(context.vars) < size:
+            level = self.rng.randint(0, self.max_level)
+            self.steps = self.max_steps
+            type_ = None
+            if self.rng.random() >= 0.3:
+                type_ = self.gen_type(context, level, self.type_size, self.type_depth + 1)
+            if type_ is None:
+                context.add_var(self.fresh_name("A"), Universe(level))
+            else:
+                base = "f" if isinstance(type_, Pi) else "a"
+                context.add_var(self.fresh_name(base), type_)
+        return context
+
+    def type_level(self, context: Context, type_: Term) -> Optional[int]:
+        """计算类型所在的Universe层级，不是类型时返回None"""
+        if isinstance(type_, Universe):
+            return type_.level + 1
+        elif isinstance(type_, Var):
+            var_type = context.get_var_type(type_.name)
+            if isinstance(var_type, Universe):
+                return var_type.level
+            return None
+        elif isinstance(type_, Pi):
+            param_level = self.type_level(context, type_.var_type)
+            if param_level is None:
+                return None
+            body_context = context.extend(type_.var_name, type_.var_type)
+            body_level = self.type_level(body_context, type_.body)
+            if body_level is None:
+                return None
+            return max(param_level, body_level)
+        return None
+
+    def big_first(self, options: list, size: int) -> list:
+        """打乱候选顺序；预算充足时多数情况下优先尝试能产生更大项的候选"""
+        self.rng.shuffle(options)
+        if size > 1 and self.rng.random() < 0.8:
+            options.sort(key=lambda option: -option[0])
+        return options
+
+    def gen_type(self, context: Context, level: int, size: int, depth: int) -> Optional[Term]:
+        """生成层级恰好为level、大小不超过size、深度不超过depth的类型"""
+        if size < 1 or depth < 1 or not self.step():
+            return None
+        options = []
+        if level >= 1:
+            options.append((0, "universe"))
+        names = [name for name, t in _entries(context)
+                 if isinstance(t, Universe) and t.level == level]
+        if names:
+            options.append((0, names))
+        if size >= 3 and depth >= 2:
+            options.append((1, "pi"))
+        for _, option in self.big_first(options, size):
+            if isinstance(option, list):
+                return Var(self.rng.choice(option))
+            result = getattr(self, f"_gen_{option}_type")(context, level, size, depth)
+            if result is not None:
+                return result
+        return None
+
+    def _gen_universe_type(self, context: Context, level: int, size: int, depth: int) -> Optional[Term]:
+        return Universe(level - 1)
+
+    def _gen_pi_type(self, context: Context, level: int, size: int, depth: int) -> Optional[Term]:
+        # 至少一侧的层级必须恰好等于level
+        exact_param = self.rng.random() < 0.5
+        param_level = level if exact_param else self.rng.randint(0, level)
+        body_level = self.rng.randint(0, level) if exact_param else level
+        param_type = self.gen_type(context, param_level, self.rng.randint(1, size - 2), depth - 1)
+        if param_type is None:
+            return None
+        base = "A" if isinstance(param_type, Universe) else "x"
+        var_name = self.fresh_name(base)
+        body_context = context.extend(var_name, param_type)
+        body = self.gen_type(body_context, body_level, size - 1 - term_size(param_type), depth - 1)
+        if body is None:
+            return None
+        return Pi(var_name, param_type, body)
+
+    def gen_term(self, context: Context, type_: Term, size: int, depth: int) -> Optional[Term]:
+        """生成类型为type_、大小不超过size、深度不超过depth的项，失败时返回None"""
+        if size < 1 or depth < 1 or not self.step():
+            return None
+        # (优先级, 生成函数)，优先级越高产生的项越大
+        options = []
+        if isinstance(type_, Pi) and not context.has_var(type_.var_name):
+            options.append((2, self._gen_lambda_term))
+        if isinstance(type_, Universe):
+            options.append((1, self._gen_universe_term))
+        spines = self.spines(context, type_, size, depth)
+        self.rng.shuffle(spines)
+        for spine in spines[:self.MAX_CANDIDATES]:
+            options.append((1 if spine[1] else 0, spine))
+        for _, option in self.big_first(options, size):
+            if isinstance(option, tuple):
+                result = self._gen_args(context, *option, size, depth)
+            else:
+                result = option(context, type_, size, depth)
+            if result is not None:
+                return result
+        return None
+
+    def _gen_lambda_term(self, context: Context, type_: Pi, size: int, depth: int) -> Optional[Term]:
+        # 检查器使用期望类型的绑定名扩展上下文，因此必须沿用同一个名字；
+        # 注解从类型复制而来，也计入大小和深度
+        annotation_size = term_size(type_.var_type)
+        if term_depth(type_.var_type) >= depth:
+            return None
+        body_context = context.extend(type_.var_name, type_.var_type)
+        body = self.gen_term(body_context, type_.body, size - 1 - annotation_size, depth - 1)
+        if body is None:
+            return None
+        return Lambda(type_.var_name, type_.var_type, body)
+
+    def _gen_universe_term(self, context: Context, type_: Universe, size: int, depth: int) -> Optional[Term]:
+        return self.gen_type(context, type_.level, size, depth)
+
+    def spines(self, context: Context, target: Term, size: int, depth: int) -> List[tuple]:
+        """列出结果类型与target alpha等价的 (变量, 参数, 匹配结果)，参数个数受大小和深度限制
+
+        每次匹配都消耗一步搜索预算，上下文很大时也不会无界地耗时。
+        """
+        result = []
+        for name, current in _entries(context):
+            params = []
+            pattern_vars = set()
+            while True:
+                # 头部变量和每个应用节点各占一个节点，深度至少为参数个数加一
+                if len(params) * 2 + 1 > size or len(params) + 1 > depth:
+                    break
+                if not self.step():
+                    return result
+                subst = _match(current, target, pattern_vars)
+                if subst is not None:
+                    result.append((name, list(params), subst))
+                if not isinstance(current, Pi):
+                    break
+                params.append(current)
+                pattern_vars = pattern_vars | {current.var_name}
+                current = current.body
+        return result
+
+    def _gen_args(self, context: Context, name: str, params: List[Pi],
+                  subst: Dict[str, Term], size: int, depth: int) -> Optional[Term]:
+        """按顺序生成参数，已由匹配确定的参数直接使用匹配结果
+
+        第i个参数（从1开始）位于 k-i+1 层应用节点之下，剩余的大小预算
+        依次分给尚未确定的参数，并为后面的参数每个至少保留一个节点。
+        """
+        k = len(params)
+        remaining = size - 1 - k
+        for index, param in enumerate(params):
+            if param.var_name in subst:
+                arg = subst[param.var_name]
+                remaining -= term_size(arg)
+                if term_depth(arg) > depth - (k - index):
+                    return None
+        if remaining < 0:
+            return None
+        term = Var(name)
+        done: Dict[str, Term] = {}
+        free = [param.var_name for param in params if param.var_name not in subst]
+        for index, param in enumerate(params):
+            param_type = _substitute_all(param.var_type, done)
+            if param.var_name in subst:
+                arg = subst[param.var_name]
+                if not isinstance(param_type, Universe):
+                    return None
+                if self.type_level(context, arg) != param_type.level:
+                    return None
+            else:
+                free.remove(param.var_name)
+                cap = remaining - len(free)
+                if cap < 1:
+                    return None
+                budget = self.rng.randint(max(1, cap // (len(free) + 1)), cap)
+                arg = self.gen_term(context, param_type, budget, depth - (k - index))
+                if arg is None:
+                    return None
+                remaining -= term_size(arg)
+            done[param.var_name] = arg
+            term = App(term, arg)
+        return term
+
+
+def _substitute_all(term: Term, subst: Dict[str, Term]) -> Term:
+    """同时替换多个变量（绑定名都是新鲜的，不会发生捕获）"""
+    if not subst:
+        return term
+    if isinstance(term, Var):
+        return subst.get(term.name, term)
+    elif isinstance(term, Pi):
+        inner = {k: v for k, v in subst.items() if k != term.var_name}
+        return Pi(term.var_name, _substitute_all(term.var_type, subst),
+                  _substitute_all(term.body, inner))
+    elif isinstance(term, Lambda):
+        inner = {k: v for k, v in subst.items() if k != term.var_name}
+        return Lambda(term.var_name, _substitute_all(term.var_type, subst),
+                      _substitute_all(term.body, inner))
+    elif isinstance(term, App):
+        return App(_substitute_all(term.func, subst), _substitute_all(term.arg, subst))
+    return term
+
+
+def _match(pattern: Term, target: Term, pattern_vars: Set[str]) -> Optional[Dict[str, Term]]:
+    """一阶模式匹配（模块alpha等价），返回模式变量的赋值"""
+    subst: Dict[str, Term] = {}
+    if _match_into(pattern, target, pattern_vars, {}, set(), subst):
+        return subst
+    return None
+
+
+def _match_into(pattern: Term, target: Term, pattern_vars: Set[str],
+                renaming: Dict[str, str], bound: Set[str], subst: Dict[str, Term]) -> bool:
+    if isinstance(pattern, Var):
+        if pattern.name in renaming:
+            return isinstance(target, Var) and target.name == renaming[pattern.name]
+        if pattern.name in pattern_vars:
+            if free_vars(target) & bound:
+                return False
+            if pattern.name in subst:
+                return _alpha_equal(subst[pattern.name], target)
+            subst[pattern.name] = target
+            return True
+        return isinstance(target, Var) and target.name == pattern.name and target.name not in bound
+    elif isinstance(pattern, Universe):
+        return isinstance(target, Universe) and target.level == pattern.level
+    elif isinstance(pattern, (Pi, Lambda)):
+        if type(pattern) is not type(target):
+            return False
+        if not _match_into(pattern.var_type, target.var_type, pattern_vars, renaming, bound, subst):
+            return False
+        inner = dict(renaming)
+        inner[pattern.var_name] = target.var_name
+        return _match_into(pattern.body, target.body, pattern_vars, inner,
+                           bound | {target.var_name}, subst)
+    elif isinstance(pattern, App):
+        return (isinstance(target, App)
+                and _match_into(pattern.func, target.func, pattern_vars, renaming, bound, subst)
+                and _match_into(pattern.arg, target.arg, pattern_vars, renaming, bound, subst))
+    return False
+
+
+def _alpha_equal(t1: Term, t2: Term) -> bool:
+    return _match(t1, t2, set()) is not None
+
+
+def generate_corpus(count: int, seed: int = 0, **kwargs) -> List[WellTypedTerm]:
+    """生成可复现的样本集合，用于基准测试"""
+    rng = random.Random(seed)
+    return [TermGenerator(rng, **kwargs).generate() for _ in range(count)]
@@ -0,0 +1,18 @@
+"""
+Hypothesis strategies built on TermGenerator (requires the `test` extra)
+"""
+
+from hypothesis import strategies as st
+from .generators import TermGenerator
+
+
+def well_typed_terms(**kwargs):
+    """生成 WellTypedTerm 的策略，参数同 TermGenerator"""
+    return st.randoms(use_true_random=False).map(
+        lambda rng: TermGenerator(rng, **kwargs).generate())
+
+
+def contexts(size: int = 4, **kwargs):
+    """生成良构上下文的策略"""
+    return st.randoms(use_true_random=False).map(
+        lambda rng: TermGenerator(rng, **kwargs).gen_context(size))
@@ -0,0 +1,122 @@
+import gc
+import pytest
+from hypothesis import given
+from mltt.syntax.terms import *
+from mltt.syntax.values import *
+from mltt.core.checker import TypeChecker, TypeError
+from mltt.core.cache import IdentityCache, CacheStats
+from mltt.testing.strategies import well_typed_terms
+
+def test_identity_cache_hits_and_misses():
+    """Test lookups by object identity rather than equality"""
+    cache = IdentityCache()
+    a, b = Var("x"), Var("x")
+    cache.put((a,), 1)
+    assert cache.get((a,)) == 1
+    assert cache.get((b,)) is None
+    assert cache.stats == CacheStats(hits=1, misses=1, evictions=0, size=1)
+
+def test_identity_cache_lru_eviction():
+    """Test that the least recently used entry is evicted"""
+    cache = IdentityCache(maxsize=2)
+    terms = [Var(str(i)) for i in range(3)]
+    cache.put((terms[0],), 0)
+    cache.put((terms[1],), 1)
+    cache.get((terms[0],))
+    cache.put((terms[2],), 2)
+    assert cache.get((terms[1],)) is None
+    assert cache.get((terms[0],)) == 0
+    assert cache.stats.evictions == 1
+    assert len(cache) == 2
+
+def test_identity_cache_drops_dead_keys():
+    """Test that entries are removed when a key object is collected"""
+    cache = IdentityCache()
+    closure, arg = ClosureValue({}, "x", Var("x")), VarValue("y")
+    cache.put((closure, arg), "result")
+    del arg
+    gc.collect()
+    assert len(cache) == 0
+    assert cache.stats.size == 0
+    cache.put((closure,), "result")
+    cache.clear()
+    assert len(cache) == 0
+
+def test_normalize_cache_is_bounded():
+    """Test that values referring to their keys are limited by maxsize"""
+    checker = TypeChecker(cache_size=100)
+    for _ in range(1000):
+        checker.normalizer.normalize(Pi("x", Var("A"), Var("A")))
+    gc.collect()
+    assert len(checker.normalizer.cache) == 100
+    assert checker.normalizer.cache.stats.evictions == 900
+
+def test_identity_cache_disabled():
+    """Test that a zero sized cache stores nothing"""
+    cache = IdentityCache(maxsize=0)
+    term = Var("x")
+    cache.put((term,), 1)
+    assert cache.get((term,)) is None
+
+def test_normalize_cache():
+    """Test that normalizing the same term object twice is a cache hit"""
+    checker = TypeChecker()
+    term = App(Lambda("x", Universe(0), Var("x")), Var("A"))
+    first = checker.normalizer.normalize(term)
+    assert checker.normalizer.normalize(term) is first
+    assert checker.normalizer.cache.stats.hits == 1
+    with checker.evaluator.in_env({"A": UniverseValue(0)}):
+        assert checker.normalizer.normalize(term) == UniverseValue(0)
+    assert checker.normalizer.cache.stats.hits == 1
+
+def test_repeated_conversion_hits_apply_cache():
+    """Test that comparing the same closures again reuses applications"""
+    checker = TypeChecker()
+    f = Lambda("x", Universe(0), App(Lambda("y", Universe(0), Var("y")), Var("x")))
+    g = Lambda("x", Universe(0), Var("x"))
+    assert checker.is_equal(f, g)
+    misses = checker.evaluator.apply_cache.stats.misses
+    assert checker.is_equal(f, g)
+    stats = checker.evaluator.apply_cache.stats
+    assert stats.misses == misses
+    assert stats.hits >= 2
+    assert not checker.is_equal(f, Lambda("z", Universe(0), Var("z")))
+
+def test_closure_comparison_uses_closure_env():
+    """Test that closure bodies are evaluated in their own environment"""
+    checker = TypeChecker()
+    v1 = ClosureValue({"y": VarValue("a")}, "x", Var("y"))
+    v2 = ClosureValue({}, "x", Var("a"))
+    assert checker.values_equal(v1, v2)
+
+@pytest.mark.parametrize("cache_size", [0, 4096])
+def test_closure_comparison_variable_is_fresh(cache_size):
+    """Test that the comparison variable cannot capture a free variable of a closure"""
+    checker = TypeChecker(cache_size=cache_size)
+    u0 = Universe(0)
+    # (λ y. λ x. y) x 规约为 λ x'. x，与 λ x. x 不同
+    captured = App(Lambda("y", u0, Lambda("x", u0, Var("y"))), Var("x"))
+    assert not checker.is_equal(captured, Lambda("x", u0, Var("x")))
+    assert checker.is_equal(captured, captured)
+
+def test_nested_closures_use_distinct_fresh_variables():
+    """Test that nested binders are compared positionally"""
+    checker = TypeChecker()
+    u0 = Universe(0)
+    first = Lambda("x", u0, Lambda("y", u0, Var("x")))
+    second = Lambda("x", u0, Lambda("y", u0, Var("y")))
+    assert not checker.is_equal(first, second)
+    assert checker.is_equal(first, Lambda("x", u0, Lambda("y", u0, Var("x"))))
+    assert checker.evaluator.fresh_var(1) is checker.evaluator.fresh_var(1)
+    assert str(checker.evaluator.fresh_var(1)) == "#1"
+
+@given(well_typed_terms(max_depth=5, max_size=64, max_level=2))
+def test_cached_checker_agrees_with_reference(sample):
+    """Test that caching does not change checking results"""
+    reference = TypeChecker(cache_size=0)
+    reference.context = sample.context
+    cached = TypeChecker()
+    cached.context = sample.context
+    for _ in range(2):
+        assert cached.check(sample.term, sample.type) == reference.check(sample.term, sample.type)
+        assert cached.infer(sample.type) == reference.infer(sample.type)
@@ -1,7 +1,8 @@
 import pytest
 from mltt.syntax.terms import *
 from mltt.core.checker import TypeChecker, TypeError
-from mltt.context import Context
+from mltt.context import Context, MAX_LAYERS
+from mltt.core.instrumentation import Instrumentation
 from functools import wraps
 
 def expect_type_error(func):
@@ -76,4 +77,80 @@ def test_universe_hierarchy_valid():
     # Type₀ : Type₁
     assert checker.check(type0, type1)
     # Type₁ : Type₂
-    assert checker.check(type1, type2)
\ No newline at end of file
+    assert checker.check(type1, type2)
+
+def test_context_extend_shares_entries():
+    """Test that extending a context shadows without copying its entries"""
+    context = Context()
+    context.add_var("A", Universe(0))
+    context.add_var("x", Var("A"))
+    inner = context.extend("x", Universe(0)).extend("y", Var("x"))
+    assert inner.get_var_type("x") == Universe(0)
+    assert inner.get_var_type("A") == Universe(0)
+    assert list(inner.vars) == ["A", "x", "y"]
+    assert context.get_var_type("x") == Var("A")
+    assert not context.has_var("y")
+    assert str(inner) == "A: Type₀, x: Type₀, y: x"
+
+def test_extended_context_is_live_view():
+    """Test that entries added to the parent later are visible in the extension"""
+    context = Context()
+    inner = context.extend("x", Universe(0))
+    context.add_var("B", Universe(1))
+    assert inner.get_var_type("B") == Universe(1)
+    assert inner.version == 0
+
+def telescope(n):
+    """λ (A : Type₀). λ (x1 : A) ... λ (xn : A). x1 : Π (A : Type₀). Π (x1 : A) ... Π (xn : A). A"""
+    type_, term = Var("A"), Var("x1")
+    for i in range(n, 0, -1):
+        type_ = Pi(f"x{i}", Var("A"), type_)
+        term = Lambda(f"x{i}", Var("A"), term)
+    return Lambda("A", Universe(0), term), Pi("A", Universe(0), type_)
+
+def test_lambda_check_is_linear():
+    """Test that each codomain of a telescope is validated only once"""
+    def infer_calls(n):
+        checker = TypeChecker()
+        with Instrumentation().attach(checker) as inst:
+            assert checker.check(*telescope(n))
+        return inst.report()["counters"]["infer"]
+    assert infer_calls(101) - infer_calls(51) == infer_calls(51) - infer_calls(1)
+
+def test_check_valid_skips_validation():
+    """Test that check_valid trusts its expected type"""
+    checker = TypeChecker()
+    checker.context.add_var("a", Var("A"))
+    assert checker.check_valid(Var("a"), Var("A"))
+    with pytest.raises(TypeError):
+        checker.check(Var("a"), Var("A"))
+
+def test_deep_context_merges_layers():
+    """Test that deep extensions merge local layers but keep shadowing"""
+    context = Context()
+    context.add_var("A", Universe(0))
+    for i in range(3 * MAX_LAYERS):
+        context = context.extend(f"x{i % 5}", Var(f"T{i}"))
+    assert len(context.vars.maps) <= MAX_LAYERS + 2
+    assert context.get_var_type("x4") == Var(f"T{3 * MAX_LAYERS - 2}")
+    assert context.get_var_type("A") == Universe(0)
+    assert context.get_var_type("missing") is None
+    assert list(context.vars) == ["A", "x0", "x1", "x2", "x3", "x4"]
+
+def test_merged_context_stops_aliasing_locals():
+    """Test that a merge detaches an extension from its ancestors' local layers only"""
+    root = Context()
+    root.add_var("A", Universe(0))
+    contexts = [root]
+    for i in range(MAX_LAYERS + 1):
+        contexts.append(contexts[-1].extend(f"x{i}", Var("A")))
+    merged = contexts[-1]
+    assert contexts[-2].is_view_of(contexts[-3])
+    assert contexts[1].is_view_of(root)
+    assert not merged.is_view_of(contexts[-2])
+    assert not root.is_view_of(contexts[1])
+    contexts[5].add_var("z", Var("A"))
+    root.add_var("B", Universe(0))
+    assert contexts[-2].get_var_type("z") == Var("A")
+    assert merged.get_var_type("z") is None
+    assert merged.get_var_type("B") == Universe(0)
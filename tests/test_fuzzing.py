@@ -2,6 +2,7 @@ import pytest
 from hypothesis import given, strategies as st
 from mltt.syntax.terms import *
 from mltt.core.checker import TypeChecker
+from mltt.testing.strategies import well_typed_terms, contexts
 
 # 定义策略：生成有效的变量名
 var_names = st.text(alphabet=st.characters(whitelist_categories=('Lu', 'Ll')), min_size=1, max_size=10)
@@ -77,4 +78,19 @@ def test_application_creation(func, arg):
     app = App(func, arg)
     assert app.func == func
     assert app.arg == arg
-    assert str(app) == f"{str(func)} {str(arg)}" 
\ No newline at end of file
+    assert str(app) == f"{str(func)} {str(arg)}" 
+
+@given(well_typed_terms(max_depth=5, max_size=64, max_level=2))
+def test_generated_terms_type_check(sample):
+    """测试生成的良类型项都能通过参考类型检查器"""
+    checker = TypeChecker()
+    checker.context = sample.context
+    assert checker.check(sample.term, sample.type)
+
+@given(contexts(size=5))
+def test_generated_contexts_well_formed(context):
+    """测试生成的上下文中每个条目都是类型"""
+    checker = TypeChecker()
+    checker.context = context
+    for type_ in context.vars.values():
+        checker.infer(type_)
@@ -0,0 +1,99 @@
+import random
+import pytest
+from mltt.syntax.terms import *
+from mltt.core.checker import TypeChecker
+from mltt.context import Context
+from mltt.testing import TermGenerator, generate_corpus, term_size, term_depth
+
+def test_corpus_is_well_typed():
+    """Test that every generated term checks against its generated type"""
+    for sample in generate_corpus(200, seed=1, max_depth=6, max_size=128, max_level=2):
+        checker = TypeChecker()
+        checker.context = sample.context
+        assert checker.check(sample.term, sample.type)
+
+def test_corpus_is_reproducible():
+    """Test that the same seed yields the same corpus"""
+    first = generate_corpus(20, seed=7)
+    second = generate_corpus(20, seed=7)
+    assert [(s.term, s.type) for s in first] == [(s.term, s.type) for s in second]
+
+def test_size_grows_with_budget():
+    """Test that a larger size budget produces larger terms"""
+    small = generate_corpus(100, seed=3, max_depth=2, max_size=8)
+    large = generate_corpus(100, seed=3, max_depth=8, max_size=256, context_size=8)
+    assert sum(term_size(s.term) for s in large) > sum(term_size(s.term) for s in small)
+
+@pytest.mark.parametrize("max_depth,max_size", [(2, 8), (4, 16), (6, 64), (10, 300)])
+def test_size_and_depth_are_hard_caps(max_depth, max_size):
+    """Test that terms never exceed the size and depth budgets, annotations included"""
+    rng = random.Random(max_size)
+    for _ in range(100):
+        sample = TermGenerator(rng, max_depth=max_depth, max_size=max_size, max_level=2).generate()
+        assert term_size(sample.term) <= max_size
+        assert term_depth(sample.term) <= max_depth
+
+def test_large_budget_is_used_within_step_budget():
+    """Test that a large budget yields large well-typed terms without exceeding the search budget"""
+    rng = random.Random(2)
+    sizes = []
+    for _ in range(10):
+        generator = TermGenerator(rng, max_depth=30, max_size=5000)
+        context = generator.gen_context(generator.context_size)
+        spent = 0
+        step = generator.step
+
+        def counted_step():
+            nonlocal spent
+            if not step():
+                return False
+            spent += 1
+            return True
+
+        generator.step = counted_step
+        sample = generator.generate(context)
+        assert 0 < spent <= generator.max_steps
+        assert term_size(sample.term) <= 5000
+        assert term_depth(sample.term) <= 30
+        sizes.append(term_size(sample.term))
+        checker = TypeChecker()
+        checker.context = sample.context
+        assert checker.check(sample.term, sample.type)
+    assert max(sizes) > 1000
+
+def test_generated_context_is_well_formed():
+    """Test that each context entry is a type in the preceding prefix"""
+    generator = TermGenerator(random.Random(0), context_size=8, max_level=2)
+    context = generator.gen_context(8)
+    assert len(context.vars) == 8
+    prefix = Context()
+    for name, type_ in context.vars.items():
+        checker = TypeChecker()
+        checker.context = prefix
+        assert generator.type_level(prefix, type_) is not None
+        checker.infer(type_)
+        prefix = prefix.extend(name, type_)
+
+def test_generate_in_given_context():
+    """Test generation in a user supplied context"""
+    context = Context()
+    context.add_var("A", Universe(0))
+    context.add_var("a", Var("A"))
+    sample = TermGenerator(random.Random(5)).generate(context)
+    assert sample.context is context
+    checker = TypeChecker()
+    checker.context = context
+    assert checker.check(sample.term, sample.type)
+
+def test_fallback_when_nothing_is_inhabited():
+    """Test the Type₀ : Type₁ fallback for an empty budget"""
+    generator = TermGenerator(random.Random(0), max_size=0, max_level=0)
+    sample = generator.generate(Context())
+    assert sample.term == Universe(0)
+    assert sample.type == Universe(1)
+
+def test_term_metrics():
+    """Test term size and depth helpers"""
+    term = Lambda("x", Universe(0), App(Var("f"), Var("x")))
+    assert term_size(term) == 5
+    assert term_depth(term) == 3
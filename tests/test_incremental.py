@@ -0,0 +1,165 @@
+import pytest
+from hypothesis import given
+from mltt.syntax.terms import *
+from mltt.core.checker import TypeChecker, TypeError
+from mltt.core.incremental import IncrementalChecker, ResultStore
+from mltt.context import MAX_LAYERS
+from mltt.testing.strategies import well_typed_terms
+
+DEPTH = 6
+
+def nat_checker(checker):
+    checker.declare("Nat", Universe(0))
+    checker.declare("zero", Var("Nat"))
+    checker.declare("plus", Pi("m", Var("Nat"), Pi("n", Var("Nat"), Var("Nat"))))
+    for i in range(2 ** DEPTH):
+        checker.declare(f"n{i}", Var("Nat"))
+    return checker
+
+def plus_tree(depth, edit=None, first=0):
+    """Balanced tree of plus applications over distinct leaves; edit replaces the leftmost leaf"""
+    if depth == 0:
+        return Var(edit or f"n{first}")
+    half = 2 ** (depth - 1)
+    return App(App(Var("plus"), plus_tree(depth - 1, edit, first)), plus_tree(depth - 1, None, first + half))
+
+def test_merkle_hash():
+    """Test that hashes follow content, not identity, and are cached on nodes"""
+    t1 = Pi("x", Var("A"), App(Var("f"), Var("x")))
+    t2 = Pi("x", Var("A"), App(Var("f"), Var("x")))
+    assert t1.merkle_hash() == t2.merkle_hash()
+    assert t1.__dict__["_merkle"] == t1.merkle_hash()
+    assert t1 == t2
+    assert Pi("y", Var("A"), Var("A")).merkle_hash() != Pi("x", Var("A"), Var("A")).merkle_hash()
+    assert Lambda("x", Var("A"), Var("A")).merkle_hash() != Pi("x", Var("A"), Var("A")).merkle_hash()
+    assert Universe(1).merkle_hash() != Universe(11).merkle_hash()
+    assert App(Var("ab"), Var("c")).merkle_hash() != App(Var("a"), Var("bc")).merkle_hash()
+
+def test_resubmission_rechecks_only_edited_path():
+    """Test that a local edit only misses along the path to the root"""
+    checker = nat_checker(IncrementalChecker())
+    depth = DEPTH
+    assert checker.check(plus_tree(depth), Var("Nat"))
+    first = checker.store.stats.misses
+    assert checker.check(plus_tree(depth), Var("Nat"))
+    assert checker.store.stats.misses == first
+    assert checker.check(plus_tree(depth, edit="zero"), Var("Nat"))
+    second = checker.store.stats.misses - first
+    assert second <= 4 * (depth + 1)
+    assert first > 2 ** depth
+
+def test_errors_are_cached():
+    """Test that type errors are stored and raised again on a hit"""
+    checker = nat_checker(IncrementalChecker())
+    bad = App(App(Var("plus"), Var("zero")), Var("Nat"))
+    with pytest.raises(TypeError) as first:
+        checker.check(bad, Var("Nat"))
+    hits = checker.store.stats.hits
+    with pytest.raises(TypeError) as second:
+        checker.check(bad, Var("Nat"))
+    assert str(first.value) == str(second.value)
+    assert checker.store.stats.hits > hits
+
+def test_unknown_term_is_a_type_error():
+    """Test that unknown node kinds are hashed and rejected by the checker"""
+    checker = IncrementalChecker()
+    assert Term().merkle_hash() == Term().merkle_hash()
+    assert Term().merkle_hash() != Var("Term()").merkle_hash()
+    for _ in range(2):
+        with pytest.raises(TypeError):
+            checker.infer(Term())
+        with pytest.raises(TypeError):
+            checker.check(Term(), Universe(0))
+
+def test_context_hash_tracks_context():
+    """Test that results are keyed by the context they were computed in"""
+    checker = IncrementalChecker()
+    checker.declare("A", Universe(0))
+    checker.declare("B", Universe(0))
+    checker.declare("a", Var("A"))
+    assert checker.infer(Var("a")) == Var("A")
+    checker.context.add_var("a", Var("B"))
+    assert checker.infer(Var("a")) == Var("B")
+
+def test_context_hash_is_incremental():
+    """Test that appending declarations matches hashing from scratch"""
+    checker = IncrementalChecker()
+    checker.declare("A", Universe(0))
+    checker.context_hash()
+    checker.declare("a", Var("A"))
+    checker.declare("b", Var("A"))
+    fresh = IncrementalChecker()
+    fresh.context = checker.context
+    fresh.context_hashes.clear()
+    assert checker.context_hash() == fresh.context_hash()
+    extended = checker.extend_context("x", Var("A"))
+    with checker.in_context(extended):
+        digest = checker.context_hash()
+    extended.add_var("y", Var("A"))
+    with checker.in_context(extended):
+        assert checker.context_hash() != digest
+
+def test_extended_context_sees_later_declarations():
+    """Test that an extended context's hash changes when its parent gains entries"""
+    checker = IncrementalChecker()
+    checker.declare("A", Universe(0))
+    extended = checker.extend_context("x", Var("A"))
+    with checker.in_context(extended):
+        with pytest.raises(TypeError):
+            checker.infer(Var("g"))
+    checker.declare("g", Var("A"))
+    nested = None
+    with checker.in_context(extended):
+        assert checker.infer(Var("g")) == Var("A")
+        nested = checker.extend_context("y", Var("A"))
+    checker.declare("h", Var("A"))
+    with checker.in_context(nested):
+        assert checker.infer(Var("h")) == Var("A")
+
+def test_merged_context_is_hashed_by_its_entries():
+    """Test that a merged extension is not hashed through its changed ancestors"""
+    checker = IncrementalChecker()
+    checker.declare("A", Universe(0))
+    root = checker.context
+    contexts = [root]
+    for i in range(MAX_LAYERS + 1):
+        checker.context = checker.extend_context(f"x{i}", Var("A"))
+        contexts.append(checker.context)
+    old = contexts[-1]
+    contexts[5].add_var("z", Var("A"))
+    checker.context = contexts[-2]
+    new = checker.extend_context(f"x{MAX_LAYERS}", Var("A"))
+    with checker.in_context(new):
+        assert checker.infer(Var("z")) == Var("A")
+    with checker.in_context(old):
+        digest = checker.context_hash()
+        with pytest.raises(TypeError):
+            checker.infer(Var("z"))
+    with checker.in_context(new):
+        assert checker.context_hash() != digest
+    reference = TypeChecker()
+    reference.context = old
+    with pytest.raises(TypeError):
+        reference.infer(Var("z"))
+
+def test_shared_store():
+    """Test that a store can be shared by several checkers"""
+    store = ResultStore(maxsize=4)
+    nat_checker(IncrementalChecker(store))
+    assert len(store) == 4
+    assert store.stats.evictions > 0
+    other = nat_checker(IncrementalChecker(store))
+    assert other.check(Var("zero"), Var("Nat"))
+    store.clear()
+    assert len(store) == 0
+
+@given(well_typed_terms(max_depth=5, max_size=64, max_level=2))
+def test_incremental_agrees_with_reference(sample):
+    """Test that incremental checking gives the reference results"""
+    reference = TypeChecker()
+    reference.context = sample.context
+    incremental = IncrementalChecker()
+    incremental.context = sample.context
+    for _ in range(2):
+        assert incremental.check(sample.term, sample.type) == reference.check(sample.term, sample.type)
+        assert incremental.infer(sample.type) == reference.infer(sample.type)
@@ -0,0 +1,112 @@
+import pytest
+from mltt.syntax.terms import *
+from mltt.core.checker import TypeChecker, TypeError
+from mltt.core.instrumentation import Instrumentation, value_size
+from mltt.context import MAX_LAYERS
+from mltt.syntax.values import *
+
+def identity():
+    type0 = Universe(0)
+    id_type = Pi("A", type0, Pi("x", Var("A"), Var("A")))
+    id_term = Lambda("A", type0, Lambda("x", Var("A"), Var("x")))
+    return id_term, id_type
+
+def fake_clock():
+    ticks = iter(range(1000000))
+    return lambda: next(ticks)
+
+def test_counters():
+    """Test that hot-path operations are counted"""
+    checker = TypeChecker()
+    id_term, id_type = identity()
+    with Instrumentation().attach(checker) as inst:
+        assert checker.check(id_term, id_type)
+        checker.evaluator.eval(App(id_term, Universe(0)))
+        checker.substitute(id_type, Universe(0), "A")
+    counters = inst.report()["counters"]
+    assert counters["check"] == 1
+    assert counters["check_valid"] == 3
+    assert counters["validate_type"] == 1
+    assert counters["infer"] > 0
+    assert counters["context_extend"] == 4
+    assert counters["context_extend_merged"] == 0
+    assert counters["apply_closure"] == 1
+    assert counters["substitute"] == 1
+    assert counters["normalize"] == counters["normalize_size"]
+
+def test_extend_counts_merged_entries():
+    """Test that only entries copied by layer merging are counted"""
+    checker = TypeChecker()
+    checker.context.add_var("A", Universe(0))
+    with Instrumentation().attach(checker) as inst:
+        for i in range(MAX_LAYERS + 2):
+            checker.context = checker.extend_context(f"x{i}", Var("A"))
+    counters = inst.report()["counters"]
+    assert counters["context_extend"] == MAX_LAYERS + 2
+    assert counters["context_extend_merged"] == MAX_LAYERS
+
+def test_detach_restores_methods():
+    """Test that detaching removes every wrapper"""
+    checker = TypeChecker()
+    inst = Instrumentation().attach(checker)
+    assert "infer" in checker.__dict__
+    inst.detach()
+    for obj in (checker, checker.evaluator, checker.normalizer):
+        assert not any(callable(v) for v in vars(obj).values())
+    checker.check(Universe(0), Universe(1))
+    assert inst.report()["counters"] == {}
+
+def test_double_attach_rejected():
+    """Test that a checker cannot be instrumented twice"""
+    checker = TypeChecker()
+    with Instrumentation().attach(checker):
+        with pytest.raises(RuntimeError):
+            Instrumentation().attach(checker)
+
+def test_tracer_events():
+    """Test that the tracer sees balanced enter/exit events"""
+    events = []
+    checker = TypeChecker()
+    with Instrumentation(tracer=lambda *e: events.append(e)).attach(checker):
+        with pytest.raises(TypeError):
+            checker.check(Var("x"), Var("y"))
+    assert events[0] == ("enter", "check", "Var", 0)
+    assert events[-1] == ("exit", "check", "Var", 0)
+    assert sum(e[0] == "enter" for e in events) == sum(e[0] == "exit" for e in events)
+    assert max(e[3] for e in events) > 0
+
+def test_tracer_kind_of_extended_context():
+    """Test that context extensions are traced by the kind of the bound type"""
+    events = []
+    checker = TypeChecker()
+    with Instrumentation(tracer=lambda *e: events.append(e)).attach(checker):
+        checker.check(*identity())
+    kinds = [e[2] for e in events if e[1] == "context_extend"]
+    assert kinds and set(kinds) <= {"Universe", "Var"}
+    assert "Universe" in kinds
+
+def test_timers_and_collapsed_stacks(tmp_path):
+    """Test self/total times and the collapsed stack export"""
+    checker = TypeChecker()
+    inst = Instrumentation(clock=fake_clock())
+    with inst.attach(checker):
+        checker.check(*identity())
+    timers = inst.report()["timers"]
+    assert timers["check"]["total"] >= timers["check"]["self"] > 0
+    total = sum(t["self"] for t in timers.values())
+    assert total == timers["check"]["total"]
+    lines = inst.collapsed_stacks().splitlines()
+    assert all(line.startswith("check") for line in lines)
+    assert "check;check_valid;check_valid" in {line.rsplit(" ", 1)[0] for line in lines}
+    path = tmp_path / "stacks.txt"
+    inst.write_collapsed_stacks(str(path))
+    assert path.read_text().splitlines() == lines
+    text = inst.format_report()
+    assert "check" in text and "normalize_size" in text
+    inst.reset()
+    assert inst.report() == {"counters": {}, "timers": {}}
+
+def test_value_size():
+    """Test value size used for normalization statistics"""
+    assert value_size(UniverseValue(0)) == 1
+    assert value_size(NeutralValue(Var("f"), [VarValue("x"), NeutralValue(Var("g"), [])])) == 3
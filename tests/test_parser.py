@@ -0,0 +1,133 @@
+import pytest
+from mltt.syntax.terms import *
+from mltt.syntax.parser import (ParseError, parse_term, parse_declarations, parse_file,
+                                tokenize, IDENT, TYPE, EOF)
+from mltt.core.checker import TypeChecker, TypeError
+from mltt.core.stream import check_declarations, check_file, StreamStats
+from mltt.testing import generate_corpus
+from mltt.__main__ import main
+
+PRELUDE = """\
+-- 自然数
+Nat : Type₀
+zero : Nat
+succ : Π (n : Nat). Nat
+id : Π (A : Type₀). Π (x : A). A
+  := λ (A : Type₀). λ (x : A). x
+one : Nat := succ zero
+two : Nat := id Nat (succ (id Nat one))
+"""
+
+def test_parse_str_syntax():
+    """Test that the output of __str__ parses back"""
+    id_type = Pi("A", Universe(0), Pi("x", Var("A"), Var("A")))
+    assert parse_term(str(id_type)) == id_type
+    assert parse_term("Type_3") == Universe(3)
+    assert parse_term("Type₁₂") == Universe(12)
+    assert parse_term("f (g x) y") == App(App(Var("f"), App(Var("g"), Var("x"))), Var("y"))
+    assert parse_term("Type₀x") == Var("Type₀x")
+
+def test_str_round_trip():
+    """Test round trips of generated terms"""
+    for sample in generate_corpus(200, seed=4, max_depth=6, max_size=64):
+        assert parse_term(str(sample.term)) == sample.term
+        assert parse_term(str(sample.type)) == sample.type
+
+def test_app_str_parenthesizes():
+    """Test that nested applications and binders are parenthesized"""
+    lam = Lambda("x", Var("A"), Var("x"))
+    assert str(App(Var("f"), App(Var("g"), Var("x")))) == "f (g x)"
+    assert str(App(lam, Var("a"))) == "(λ (x : A). x) a"
+
+def test_parse_declarations():
+    """Test parsing a stream of declarations without separators"""
+    decls = list(parse_declarations([PRELUDE]))
+    assert [d.name for d in decls] == ["Nat", "zero", "succ", "id", "one", "two"]
+    assert decls[3].line == 5
+    assert decls[3].term == Lambda("A", Universe(0), Lambda("x", Var("A"), Var("x")))
+    assert decls[4].term == App(Var("succ"), Var("zero"))
+    assert decls[0].term is None
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64])
+def test_tokens_split_across_chunks(chunk_size):
+    """Test that tokens spanning chunk boundaries are reassembled"""
+    chunks = [PRELUDE[i:i + chunk_size] for i in range(0, len(PRELUDE), chunk_size)]
+    assert list(tokenize(chunks)) == list(tokenize([PRELUDE]))
+
+def test_parse_is_incremental():
+    """Test that a declaration is produced before later input is read"""
+    def chunks():
+        yield "A : Type₀\n"
+        yield "a : A\n"
+        raise AssertionError("read too far")
+    decls = parse_declarations(chunks())
+    assert next(decls).name == "A"
+
+@pytest.mark.parametrize("text, line", [
+    ("x : Type₀\ny : #", 2),
+    ("x : (A", 1),
+    ("x Type₀", 1),
+    ("x : Π x : A. B", 1),
+    ("x : )", 1),
+])
+def test_parse_errors(text, line):
+    """Test that syntax errors report the line"""
+    with pytest.raises(ParseError) as info:
+        list(parse_declarations([text]))
+    assert info.value.line == line
+
+def test_parse_term_trailing_input():
+    """Test that parse_term rejects trailing input"""
+    with pytest.raises(ParseError):
+        parse_term("A )")
+
+def test_check_file(tmp_path):
+    """Test streaming a file into the checker"""
+    path = tmp_path / "prelude.mltt"
+    path.write_text(PRELUDE, encoding="utf-8")
+    reports = []
+    checker = TypeChecker()
+    stats = check_file(str(path), checker, progress=reports.append, report_every=2)
+    assert stats.declarations == 6
+    assert len(reports) == 3
+    assert stats.rate > 0
+    assert "6 declarations" in str(stats)
+    assert checker.context.get_var_type("two") == Var("Nat")
+    assert StreamStats().rate == 0.0
+
+def test_check_reports_failing_declaration():
+    """Test that type errors name the declaration and line"""
+    with pytest.raises(TypeError) as info:
+        check_declarations(parse_declarations(["A : Type₀\nbad : A := Type₀\n"]))
+    assert "第2行 bad" in str(info.value)
+
+def test_parse_file_skips_bom(tmp_path):
+    """Test that a leading UTF-8 byte order mark is ignored"""
+    path = tmp_path / "bom.mltt"
+    path.write_text(PRELUDE, encoding="utf-8-sig")
+    assert path.read_bytes().startswith(b"\xef\xbb\xbf")
+    decls = list(parse_file(str(path), chunk_size=1))
+    assert (decls[0].name, decls[0].line) == ("Nat", 2)
+    assert check_file(str(path)).declarations == 6
+
+def test_main(tmp_path, capsys):
+    """Test the command line entry point"""
+    good = tmp_path / "good.mltt"
+    good.write_text(PRELUDE, encoding="utf-8")
+    bad = tmp_path / "bad.mltt"
+    bad.write_text("x : y\n", encoding="utf-8")
+    assert main([str(good)]) == 0
+    assert "6 declarations" in capsys.readouterr().out
+    assert main([str(good), str(bad)]) == 1
+    assert "bad.mltt" in capsys.readouterr().err
+
+def test_main_reporting_and_missing_file(tmp_path, capsys):
+    """Test that --report-every 0 disables progress and missing files fail cleanly"""
+    good = tmp_path / "good.mltt"
+    good.write_text(PRELUDE, encoding="utf-8")
+    assert main(["--report-every", "0", str(good)]) == 0
+    assert capsys.readouterr().err == ""
+    assert main([str(tmp_path / "missing.mltt")]) == 1
+    assert "missing.mltt" in capsys.readouterr().err
+    with pytest.raises(SystemExit):
+        main(["--report-every", "-1", str(good)])
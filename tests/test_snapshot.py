@@ -0,0 +1,121 @@
+import hashlib
+import json
+import zlib
+import pytest
+from mltt.syntax.terms import *
+from mltt.core.checker import TypeChecker, TypeError
+from mltt.core.snapshot import dumps, loads, save_snapshot, load_snapshot, SnapshotError
+from mltt.core.snapshot import TermTable, decode_terms, HEADER, MAGIC, VERSION
+from mltt.core.incremental import IncrementalChecker
+
+def prelude():
+    """Build a checker with a small checked prelude"""
+    checker = TypeChecker()
+    type0 = Universe(0)
+    id_type = Pi("A", type0, Pi("x", Var("A"), Var("A")))
+    id_term = Lambda("A", type0, Lambda("x", Var("A"), Var("x")))
+    checker.declare("Nat", type0)
+    checker.declare("zero", Var("Nat"))
+    checker.declare("succ", Pi("n", Var("Nat"), Var("Nat")))
+    checker.declare("id", id_type, id_term)
+    return checker
+
+def test_declare_rejects_ill_typed():
+    """Test that declarations are checked before being added"""
+    checker = TypeChecker()
+    with pytest.raises(TypeError):
+        checker.declare("x", Var("Missing"))
+    with pytest.raises(TypeError):
+        checker.declare("bad", Universe(0), Universe(1))
+    checker.declare("A", Universe(0))
+    checker.declare("a", Var("A"))
+    with pytest.raises(TypeError):
+        checker.declare("b", Var("a"))
+    assert list(checker.context.vars) == ["A", "a"]
+
+def test_round_trip(tmp_path):
+    """Test that a restored checker has the same context and keeps working"""
+    checker = prelude()
+    path = tmp_path / "prelude.snap"
+    save_snapshot(checker, str(path))
+    restored = load_snapshot(str(path))
+    assert restored.context.vars == checker.context.vars
+    assert list(restored.context.vars) == list(checker.context.vars)
+    assert restored.check(App(Var("succ"), Var("zero")), Var("Nat"))
+
+def test_incremental_warm_start(tmp_path):
+    """Test that an incremental checker's results survive a snapshot round trip"""
+    checker = IncrementalChecker()
+    checker.declare("Nat", Universe(0))
+    checker.declare("zero", Var("Nat"))
+    checker.declare("succ", Pi("n", Var("Nat"), Var("Nat")))
+    two = App(Var("succ"), App(Var("succ"), Var("zero")))
+    assert checker.check(two, Var("Nat"))
+    with pytest.raises(TypeError):
+        checker.infer(App(Var("zero"), Var("zero")))
+    path = tmp_path / "incremental.snap"
+    save_snapshot(checker, str(path))
+    restored = load_snapshot(str(path))
+    assert isinstance(restored, IncrementalChecker)
+    assert list(restored.store.entries) == list(checker.store.entries)
+    assert restored.check(two, Var("Nat"))
+    assert restored.infer(two) == Var("Nat")
+    with pytest.raises(TypeError):
+        restored.infer(App(Var("zero"), Var("zero")))
+    assert restored.store.stats.misses == 0
+    assert restored.store.stats.hits > 0
+
+def test_shared_subterms():
+    """Test that structurally equal subterms are stored once and restored shared"""
+    checker = TypeChecker()
+    checker.declare("Nat", Universe(0))
+    checker.declare("f", Pi("n", Var("Nat"), Var("Nat")))
+    checker.declare("g", Pi("n", Var("Nat"), Var("Nat")))
+    restored = loads(dumps(checker))
+    f_type = restored.context.get_var_type("f")
+    assert f_type is restored.context.get_var_type("g")
+    assert f_type.var_type is f_type.body
+
+def test_corruption_detected():
+    """Test that a damaged payload is rejected"""
+    data = bytearray(dumps(prelude()))
+    data[-1] ^= 0xFF
+    with pytest.raises(SnapshotError):
+        loads(bytes(data))
+
+def pack(payload):
+    """Build a snapshot with a valid header around an arbitrary payload"""
+    body = zlib.compress(json.dumps(payload).encode("utf-8"))
+    return HEADER.pack(MAGIC, VERSION, hashlib.sha256(body).digest()) + body
+
+@pytest.mark.parametrize("payload", [
+    {"context": []},
+    {"terms": [], "context": [["x", 0]]},
+    {"terms": [["V", "A"], ["P", "x", 0, -1]], "context": []},
+    {"terms": [5], "context": []},
+    {"terms": [["U", 0]], "context": [["A"]]},
+    {"terms": [["U", 0]], "context": [], "results": [[["zz"], "B", True]]},
+    {"terms": [["U", 0]], "context": [], "results": [[[], "T", 3]]},
+    [],
+])
+def test_malformed_payload(payload):
+    """Test that a well-formed header around a malformed payload is rejected"""
+    with pytest.raises(SnapshotError):
+        loads(pack(payload))
+
+@pytest.mark.parametrize("mutate", [
+    lambda data: data[:4],
+    lambda data: b"NOTASNAP" + data[8:],
+    lambda data: data[:8] + b"\x00\x63" + data[10:],
+])
+def test_invalid_header(mutate):
+    """Test truncated files, wrong magic and unknown versions"""
+    with pytest.raises(SnapshotError):
+        loads(mutate(dumps(prelude())))
+
+def test_unknown_tag():
+    """Test that unknown node tags are rejected"""
+    with pytest.raises(SnapshotError):
+        decode_terms([["X", 1]])
+    with pytest.raises(SnapshotError):
+        TermTable().add(Term())